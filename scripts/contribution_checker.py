@@ -6,93 +6,87 @@ Analyzes git logs to measure team member contribution fairness using Gini coeffi
 import json
 import os
 import subprocess
+import threading
 
+import numpy as np
 
-def _parse_git_shortlog() -> dict:
-    """Parse git shortlog to get commit counts per author."""
-    try:
-        result = subprocess.run(
-            ["git", "shortlog", "-sn", "--all", "--no-merges"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        members = {}
-        for line in result.stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            parts = line.split("\t", 1)
-            if len(parts) == 2:
-                count = int(parts[0].strip())
-                name = parts[1].strip()
-                members[name] = {"commits": count, "additions": 0, "deletions": 0}
-        return members
-    except Exception:
-        return {}
 
+def _parse_git_numstat() -> dict:
+    """
+    Parse one git log pass to get commits and lines added/deleted per author.
 
-def _parse_git_numstat(members: dict) -> dict:
-    """Parse git log numstat to get lines added/deleted per author."""
+    Commit headers are prefixed with %x01 so an author line can never be
+    mistaken for a numstat row; commits are counted per header.
+    """
+    members = {}
     try:
-        result = subprocess.run(
-            ["git", "log", "--all", "--no-merges", "--format=%aN", "--numstat"],
-            capture_output=True,
+        proc = subprocess.Popen(
+            ["git", "log", "--all", "--no-merges", "--pretty=tformat:%x01%aN", "--numstat"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=60,
+            bufsize=1 << 20,
         )
-        current_author = None
-        for line in result.stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            # Lines with tab-separated numbers are numstat lines
-            parts = line.split("\t")
-            if len(parts) == 3:
-                try:
-                    added = int(parts[0]) if parts[0] != "-" else 0
-                    deleted = int(parts[1]) if parts[1] != "-" else 0
-                    if current_author and current_author in members:
-                        members[current_author]["additions"] += added
-                        members[current_author]["deletions"] += deleted
-                except ValueError:
-                    pass
-            else:
-                # This line is an author name
-                current_author = line
-                if current_author not in members:
-                    members[current_author] = {"commits": 0, "additions": 0, "deletions": 0}
+        # Enforce the 60 s cap on git log while streaming: the timer kills
+        # git, which ends the read loop at EOF
+        timer = threading.Timer(60, proc.kill)
+        timer.start()
+        try:
+            with proc:
+                # Record of the author whose numstat rows are being read
+                rec = None
+                # Stream line-by-line so the full history is never held in memory
+                for line in proc.stdout:
+                    if line.endswith("\n"):
+                        line = line[:-1]
+                    if not line:
+                        continue
+                    if line[0] == "\x01":
+                        # Commit header — one per commit
+                        rec = members.setdefault(line[1:], {"commits": 0, "additions": 0, "deletions": 0})
+                        rec["commits"] += 1
+                        continue
+
+                    # Lines with tab-separated numbers are numstat lines;
+                    # partition avoids building a list and never scans the path
+                    added_str, sep1, rest = line.partition("\t")
+                    deleted_str, sep2, _ = rest.partition("\t")
+                    if sep1 and sep2:
+                        try:
+                            added = int(added_str) if added_str != "-" else 0
+                            deleted = int(deleted_str) if deleted_str != "-" else 0
+                            if rec is not None:
+                                rec["additions"] += added
+                                rec["deletions"] += deleted
+                        except ValueError:
+                            pass
+        finally:
+            timer.cancel()
+        if proc.returncode < 0:
+            # Killed on timeout — the counts are partial, so report none
+            return {}
         return members
     except Exception:
         return members
 
 
-def _calculate_gini(values: list) -> float:
+def _calculate_gini(values) -> float:
     """
-    Calculate the Gini coefficient for a list of values.
+    Calculate the Gini coefficient for a sequence of values.
     0 = perfect equality, 1 = total inequality.
     """
-    if not values or sum(values) == 0:
-        return 0.0
-
-    n = len(values)
-    if n == 1:
+    # Sorted closed form: G = 2·Σ(i·x_i) / (n·Σx) − (n + 1) / n
+    sorted_values = np.sort(np.asarray(values, dtype=np.float64))
+    n = sorted_values.size
+    if n <= 1:
         return 0.0
 
-    sorted_values = sorted(values)
-    total = sum(sorted_values)
-
-    # Gini formula
-    numerator = 0
-    for i, xi in enumerate(sorted_values):
-        for j, xj in enumerate(sorted_values):
-            numerator += abs(xi - xj)
-
-    denominator = 2 * n * total
-    if denominator == 0:
+    total = sorted_values.sum()
+    if total == 0:
         return 0.0
 
-    return numerator / denominator
+    ranks = np.arange(1, n + 1)
+    return float((2 * np.dot(ranks, sorted_values)) / (n * total) - (n + 1) / n)
 
 
 def check_contributions(min_contribution_pct: float = 10.0) -> dict:
@@ -106,8 +100,7 @@ def check_contributions(min_contribution_pct: float = 10.0) -> dict:
         dict with contribution evaluation results
     """
     # Parse git data
-    members = _parse_git_shortlog()
-    members = _parse_git_numstat(members)
+    members = _parse_git_numstat()
 
     if not members:
         return {
@@ -123,10 +116,15 @@ def check_contributions(min_contribution_pct: float = 10.0) -> dict:
     total_commits = sum(m["commits"] for m in members.values())
     total_additions = sum(m["additions"] for m in members.values())
 
-    # Calculate percentages
+    # Single pass: percentages, low-contribution warnings and the top contributor
+    warnings = []
+    flag_low = total_commits > 5
+    dominant_name = None
+    dominant = None
     for name, data in members.items():
+        commits = data["commits"]
         if total_commits > 0:
-            data["commit_pct"] = round((data["commits"] / total_commits) * 100, 1)
+            data["commit_pct"] = round((commits / total_commits) * 100, 1)
         else:
             data["commit_pct"] = 0.0
         if total_additions > 0:
@@ -134,25 +132,23 @@ def check_contributions(min_contribution_pct: float = 10.0) -> dict:
         else:
             data["addition_pct"] = 0.0
 
-    # Calculate Gini coefficient on commits
-    commit_counts = [m["commits"] for m in members.values()]
-    gini = round(_calculate_gini(commit_counts), 3)
-
-    # Generate warnings
-    warnings = []
-    for name, data in members.items():
-        if data["commit_pct"] < min_contribution_pct and total_commits > 5:
+        if flag_low and data["commit_pct"] < min_contribution_pct:
             warnings.append(
                 f"⚠️ {name} has only {data['commit_pct']}% of commits "
-                f"({data['commits']}/{total_commits})"
+                f"({commits}/{total_commits})"
             )
 
+        if dominant is None or commits > dominant["commits"]:
+            dominant_name, dominant = name, data
+
+    # Calculate Gini coefficient on commits
+    commit_counts = np.fromiter((m["commits"] for m in members.values()), dtype=np.int64, count=len(members))
+    gini = round(_calculate_gini(commit_counts), 3)
+
     # Check for single-person dominance
-    max_pct = max(m["commit_pct"] for m in members.values()) if members else 0
-    if max_pct > 70 and len(members) > 1:
-        dominant = max(members.items(), key=lambda x: x[1]["commits"])
+    if dominant["commit_pct"] > 70 and len(members) > 1:
         warnings.append(
-            f"🚨 {dominant[0]} dominates with {dominant[1]['commit_pct']}% of all commits"
+            f"🚨 {dominant_name} dominates with {dominant['commit_pct']}% of all commits"
         )
 
     # Determine pass/fail
@@ -188,5 +184,12 @@ def check_contributions(min_contribution_pct: float = 10.0) -> dict:
 
 
 if __name__ == "__main__":
+    import sys
+
     result = check_contributions()
-    print(json.dumps(result, indent=2))
+    try:
+        import orjson
+    except ImportError:
+        print(json.dumps(result))
+    else:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
@@ -5,9 +5,13 @@ Runs all evaluation checks and generates a markdown report
 that gets posted as a commit comment by the GitHub Action.
 """
 
+import copy
+import io
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -20,7 +24,13 @@ from plagiarism_checker import check_plagiarism
 
 
 def load_config(config_path: str = ".pbl/config.json") -> dict:
-    """Load the PBL configuration file."""
+    """Load the PBL configuration file (parsed once per path, returned as a fresh copy)."""
+    return copy.deepcopy(_read_config(config_path))
+
+
+@lru_cache(maxsize=4)
+def _read_config(config_path: str) -> dict:
+    """Read and parse the config file — cached, so callers must not mutate the result."""
     try:
         with open(config_path, "r") as f:
             return json.load(f)
@@ -61,50 +71,63 @@ def run_evaluation(
     commit_author = commit_author or os.environ.get("COMMIT_AUTHOR", "unknown")
     github_token = github_token or os.environ.get("GITHUB_TOKEN", "")
 
-    results = {}
-
-    # 1. Timing Check
-    print("🔍 Running timing check...")
-    if commit_timestamp:
-        results["timing"] = check_timing(config, commit_timestamp)
-    else:
-        results["timing"] = {
-            "passed": True,
-            "status": "⚠️ No timestamp available",
-            "status_emoji": "⚠️",
-            "detail": "Commit timestamp not available",
-            "is_class_day": False,
-            "current_phase": "Unknown",
-            "commit_day": "Unknown",
-        }
-
-    # 2. Code Quality Check
-    print("🔍 Running code quality check...")
-    results["quality"] = check_quality(
-        source_dir=source_dir,
-        language=config.get("language", "python"),
-        min_score=config.get("min_quality_score", 7.0),
-    )
-
-    # 3. Proof of Progress Check
-    print("🔍 Running proof check...")
-    results["proofs"] = check_proofs(
-        proof_dir=config.get("proof_directory", "proofs/"),
-        commit_sha=commit_sha,
-    )
-
-    # 4. Contribution Equity Check
-    print("🔍 Running contribution check...")
-    results["contribution"] = check_contributions()
-
-    # 5. Plagiarism Check (5 Layers)
-    print("🔍 Running 5-layer plagiarism check...")
-    results["plagiarism"] = check_plagiarism(
-        source_dir=source_dir,
-        reference_dir=reference_dir,
-        config=config,
-        github_token=github_token,
-    )
+    # The checks are independent and mostly wait on subprocesses (git, pylint,
+    # copydetect) or the network, so run them concurrently
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = {}
+
+        # 1. Timing Check
+        print("🔍 Running timing check...")
+        if commit_timestamp:
+            futures["timing"] = executor.submit(check_timing, config, commit_timestamp)
+
+        # 2. Code Quality Check
+        print("🔍 Running code quality check...")
+        futures["quality"] = executor.submit(
+            check_quality,
+            source_dir=source_dir,
+            language=config.get("language", "python"),
+            min_score=config.get("min_quality_score", 7.0),
+        )
+
+        # 3. Proof of Progress Check
+        print("🔍 Running proof check...")
+        futures["proofs"] = executor.submit(
+            check_proofs,
+            proof_dir=config.get("proof_directory", "proofs/"),
+            commit_sha=commit_sha,
+        )
+
+        # 4. Contribution Equity Check
+        print("🔍 Running contribution check...")
+        futures["contribution"] = executor.submit(check_contributions)
+
+        # 5. Plagiarism Check (5 Layers)
+        print("🔍 Running 5-layer plagiarism check...")
+        futures["plagiarism"] = executor.submit(
+            check_plagiarism,
+            source_dir=source_dir,
+            reference_dir=reference_dir,
+            config=config,
+            github_token=github_token,
+        )
+
+        results = {}
+        if "timing" in futures:
+            # TimingResult is a read-only mapping; the report is serialised as JSON
+            results["timing"] = dict(futures["timing"].result())
+        else:
+            results["timing"] = {
+                "passed": True,
+                "status": "⚠️ No timestamp available",
+                "status_emoji": "⚠️",
+                "detail": "Commit timestamp not available",
+                "is_class_day": False,
+                "current_phase": "Unknown",
+                "commit_day": "Unknown",
+            }
+        for name in ("quality", "proofs", "contribution", "plagiarism"):
+            results[name] = futures[name].result()
 
     # Generate markdown report
     report = generate_markdown_report(results, config, commit_sha, commit_author)
@@ -132,17 +155,19 @@ def generate_markdown_report(
     plagiarism = results.get("plagiarism", {})
     plag_layers = plagiarism.get("layers", {})
 
+    # Write straight into one buffer instead of collecting lines and joining them
+    buf = io.StringIO()
+    w = buf.write
+
     # Build the main table
-    lines = [
-        "## 🤖 PBL Guardian — Evaluation Report",
-        "",
-        "| Metric | Result | Status |",
-        "|---|---|---|",
-        f"| ⏰ Timing | {timing.get('detail', 'N/A')} | {timing.get('status_emoji', '⚠️')} |",
-        f"| 📊 Code Quality | {quality.get('detail', 'N/A')} | {quality.get('status_emoji', '⚠️')} |",
-        f"| 📸 Proofs | {proofs.get('detail', 'N/A')} | {proofs.get('status_emoji', '⚠️')} |",
-        f"| 👥 Contribution | {contribution.get('detail', 'N/A')} | {contribution.get('status_emoji', '⚠️')} |",
-    ]
+    w("## 🤖 PBL Guardian — Evaluation Report\n")
+    w("\n")
+    w("| Metric | Result | Status |\n")
+    w("|---|---|---|\n")
+    w(f"| ⏰ Timing | {timing.get('detail', 'N/A')} | {timing.get('status_emoji', '⚠️')} |\n")
+    w(f"| 📊 Code Quality | {quality.get('detail', 'N/A')} | {quality.get('status_emoji', '⚠️')} |\n")
+    w(f"| 📸 Proofs | {proofs.get('detail', 'N/A')} | {proofs.get('status_emoji', '⚠️')} |\n")
+    w(f"| 👥 Contribution | {contribution.get('detail', 'N/A')} | {contribution.get('status_emoji', '⚠️')} |\n")
 
     # Add plagiarism layers
     l1 = plag_layers.get("L1_copydetect", {})
@@ -150,96 +175,89 @@ def generate_markdown_report(
     l4 = plag_layers.get("L4_ai_detection", {})
     l5 = plag_layers.get("L5_commit_patterns", {})
 
-    lines.append(f"| 🔍 Plagiarism (L1 Corpus) | {l1.get('detail', 'N/A')} | {l1.get('passed', True) and '✅' or '🚨'} |")
-    lines.append(f"| 🔍 Plagiarism (L3 GitHub) | {l3.get('detail', 'N/A')} | {l3.get('passed', True) and '✅' or '🚨'} |")
-    lines.append(f"| 🤖 AI Detection (L4) | {l4.get('detail', 'N/A')} | {l4.get('passed', True) and '✅' or '🚨'} |")
-    lines.append(f"| 📈 Commit Patterns (L5) | {l5.get('detail', 'N/A')} | {l5.get('passed', True) and '✅' or '🚨'} |")
+    w(f"| 🔍 Plagiarism (L1 Corpus) | {l1.get('detail', 'N/A')} | {l1.get('passed', True) and '✅' or '🚨'} |\n")
+    w(f"| 🔍 Plagiarism (L3 GitHub) | {l3.get('detail', 'N/A')} | {l3.get('passed', True) and '✅' or '🚨'} |\n")
+    w(f"| 🤖 AI Detection (L4) | {l4.get('detail', 'N/A')} | {l4.get('passed', True) and '✅' or '🚨'} |\n")
+    w(f"| 📈 Commit Patterns (L5) | {l5.get('detail', 'N/A')} | {l5.get('passed', True) and '✅' or '🚨'} |\n")
 
     # Metadata line
-    lines.extend([
-        "",
+    w("\n")
+    w(
         f"**Commit by:** {commit_author} | "
         f"**Phase:** {timing.get('current_phase', 'N/A')} | "
-        f"**Class Day:** {'✅ ' + timing.get('commit_day', '') if timing.get('is_class_day') else '—'}",
-    ])
+        f"**Class Day:** {'✅ ' + timing.get('commit_day', '') if timing.get('is_class_day') else '—'}\n"
+    )
+
+    members = contribution.get("members", {})
+    has_plag_details = bool(l1.get("flagged_files") or l3.get("flagged") or l4.get("flags") or l5.get("flags"))
+    has_quality_details = bool(quality.get("issues"))
+    has_contrib_details = bool(members or contribution.get("warnings"))
+
+    # Build expandable sections
+    if has_plag_details or has_quality_details or has_contrib_details:
+        w("\n")
 
     # Expandable details for plagiarism
-    plag_details = []
-    if l1.get("flagged_files"):
-        plag_details.append(f"**L1 Copydetect:** {l1['detail']}")
-        for f in l1["flagged_files"][:3]:
-            plag_details.append(f"  - {f.get('detail', str(f))}")
-
-    if l3.get("flagged"):
-        plag_details.append(f"**L3 GitHub Search:** {l3['detail']}")
-        for f in l3["flagged"][:3]:
-            plag_details.append(f"  - `{f['function']}` in {f['file']} → matches {f['top_match_repo']}")
-
-    if l4.get("flags"):
-        plag_details.append(f"**L4 AI Detection:** {l4['detail']}")
-        for f in l4["flags"][:3]:
-            plag_details.append(f"  - {f}")
-
-    if l5.get("flags"):
-        plag_details.append(f"**L5 Commit Patterns:** {l5['detail']}")
-        for f in l5["flags"][:3]:
-            plag_details.append(f"  - {f}")
+    if has_plag_details:
+        w("<details><summary>🔍 Plagiarism Details</summary>\n")
+        w("\n")
+        if l1.get("flagged_files"):
+            w(f"**L1 Copydetect:** {l1['detail']}\n")
+            for f in l1["flagged_files"][:3]:
+                w(f"  - {f.get('detail', str(f))}\n")
+
+        if l3.get("flagged"):
+            w(f"**L3 GitHub Search:** {l3['detail']}\n")
+            for f in l3["flagged"][:3]:
+                w(f"  - `{f['function']}` in {f['file']} → matches {f['top_match_repo']}\n")
+
+        if l4.get("flags"):
+            w(f"**L4 AI Detection:** {l4['detail']}\n")
+            for f in l4["flags"][:3]:
+                w(f"  - {f}\n")
+
+        if l5.get("flags"):
+            w(f"**L5 Commit Patterns:** {l5['detail']}\n")
+            for f in l5["flags"][:3]:
+                w(f"  - {f}\n")
+        w("\n")
+        w("</details>\n")
 
     # Quality issues details
-    quality_details = []
-    if quality.get("issues"):
-        quality_details.append("**Top Issues:**")
+    if has_quality_details:
+        w("<details><summary>📊 Quality Details</summary>\n")
+        w("\n")
+        w("**Top Issues:**\n")
         for issue in quality["issues"][:5]:
-            quality_details.append(
+            w(
                 f"  - `{issue.get('file', '?')}:{issue.get('line', '?')}` "
-                f"[{issue.get('symbol', '')}] {issue.get('message', '')}"
+                f"[{issue.get('symbol', '')}] {issue.get('message', '')}\n"
             )
+        w("\n")
+        w("</details>\n")
 
     # Contribution details
-    contrib_details = []
-    members = contribution.get("members", {})
-    if members:
-        contrib_details.append("| Member | Commits | Additions | % |")
-        contrib_details.append("|---|---|---|---|")
-        for name, data in sorted(members.items(), key=lambda x: x[1]["commits"], reverse=True):
-            contrib_details.append(
-                f"| {name} | {data['commits']} | +{data['additions']}/-{data['deletions']} | {data.get('commit_pct', 0)}% |"
-            )
-
-    if contribution.get("warnings"):
-        for w in contribution["warnings"]:
-            contrib_details.append(f"\n{w}")
-
-    # Build expandable sections
-    if plag_details or quality_details or contrib_details:
-        lines.append("")
-
-    if plag_details:
-        lines.append("<details><summary>🔍 Plagiarism Details</summary>")
-        lines.append("")
-        lines.extend(plag_details)
-        lines.append("")
-        lines.append("</details>")
-
-    if quality_details:
-        lines.append("<details><summary>📊 Quality Details</summary>")
-        lines.append("")
-        lines.extend(quality_details)
-        lines.append("")
-        lines.append("</details>")
+    if has_contrib_details:
+        w("<details><summary>👥 Contribution Details</summary>\n")
+        w("\n")
+        if members:
+            w("| Member | Commits | Additions | % |\n")
+            w("|---|---|---|---|\n")
+            for name, data in sorted(members.items(), key=lambda x: x[1]["commits"], reverse=True):
+                w(
+                    f"| {name} | {data['commits']} | +{data['additions']}/-{data['deletions']} | {data.get('commit_pct', 0)}% |\n"
+                )
 
-    if contrib_details:
-        lines.append("<details><summary>👥 Contribution Details</summary>")
-        lines.append("")
-        lines.extend(contrib_details)
-        lines.append("")
-        lines.append("</details>")
+        for warning in contribution.get("warnings") or ():
+            w(f"\n{warning}\n")
+        w("\n")
+        w("</details>\n")
 
-    lines.append("")
-    lines.append(f"---")
-    lines.append(f"*PBL Guardian v1.0 | Team: {config.get('team_name', 'Unknown')} ({config.get('team_id', '?')})*")
+    w("\n")
+    w("---\n")
+    w(f"*PBL Guardian v1.0 | Team: {config.get('team_name', 'Unknown')} ({config.get('team_id', '?')})*")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 if __name__ == "__main__":
@@ -270,8 +288,23 @@ if __name__ == "__main__":
 
     # Save full JSON results
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(result["results"], f, indent=2, default=str)
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+
+        if orjson is not None:
+            # orjson serialises (and indents) in C — much faster than json's pretty-printer
+            with open(args.output, "wb") as f:
+                f.write(orjson.dumps(
+                    result["results"],
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                    default=str,
+                ))
+        else:
+            # Machine-read artifact: compact output skips the slow indenting path
+            with open(args.output, "w") as f:
+                json.dump(result["results"], f, default=str)
         print(f"\n📝 Full results saved to {args.output}")
 
     # Also write report to a file for the GitHub Action to read
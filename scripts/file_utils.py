@@ -0,0 +1,46 @@
+"""
+PBL Guardian — File Utilities
+Source-tree helpers shared by the checkers.
+"""
+
+import os
+
+
+def iter_py_files(root: str):
+    """
+    Yield every .py file under root, skipping hidden dirs and __pycache__.
+
+    Visits files in the same order as a top-down os.walk (each directory's
+    files, then its subdirectories depth-first) and, like os.walk, does not
+    descend into symlinked directories. Uses os.scandir directly so most
+    entries need no extra stat call.
+
+    Args:
+        root: Directory to search
+
+    Yields:
+        Path of each Python file, joined onto root
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        files = []
+        subdirs = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    name = entry.name
+                    if not (name.startswith(".") or name == "__pycache__" or entry.is_symlink()):
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    files.append(entry.path)
+        yield from files
+        # Reversed so the first subdirectory is popped (and walked) first
+        stack.extend(reversed(subdirs))
@@ -9,18 +9,39 @@ Layer 5: Commit Behavior Analysis — detect code dumps and suspicious patterns
 """
 
 import ast
+import atexit
+import hashlib
+import heapq
+import itertools
 import json
+import mmap
 import os
 import re
+import multiprocessing
 import subprocess
 import sys
-from datetime import datetime, timedelta
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from .file_utils import iter_py_files
+except ImportError:  # Run as a plain script with scripts/ on sys.path (evaluate.py)
+    from file_utils import iter_py_files
 
 
 # =============================================================================
 # LAYER 1: Copydetect — Local Corpus Comparison
 # =============================================================================
 
+# Similarity percentage in copydetect's report lines (matched on raw bytes)
+_PCT_RE = re.compile(rb"(\d+\.?\d*)%")
+
+
 def layer1_copydetect(source_dir: str, reference_dir: str, threshold: float = 0.3) -> dict:
     """
     Compare student code against reference repos using copydetect.
@@ -53,30 +74,40 @@ def layer1_copydetect(source_dir: str, reference_dir: str, threshold: float = 0.
                 "--out", "/tmp/pbl_copydetect_report.html",
             ],
             capture_output=True,
-            text=True,
             timeout=180,
         )
 
-        # Parse output for similarity scores
+        # Parse output for similarity scores — kept as bytes to skip decoding the full report
         output = result.stdout + result.stderr
-        max_similarity = 0
-        flagged = []
+        pcts = []
+        matched_lines = []
 
         # Copydetect prints similarity info to stdout
-        for line in output.split("\n"):
-            if "%" in line and ("similar" in line.lower() or "match" in line.lower()):
-                try:
-                    pct = float(re.search(r"(\d+\.?\d*)%", line).group(1))
-                    max_similarity = max(max_similarity, pct)
-                    if pct >= threshold * 100:
-                        flagged.append({"detail": line.strip(), "score": pct})
-                except (AttributeError, ValueError):
-                    pass
+        for line in output.splitlines():
+            # Cheap substring gates before touching the regex
+            if b"%" not in line:
+                continue
+            if (b"similar" not in line and b"Similar" not in line
+                    and b"match" not in line and b"Match" not in line):
+                continue
+            m = _PCT_RE.search(line)
+            if m:
+                pcts.append(float(m.group(1)))
+                matched_lines.append(line)
+
+        # Reduce once at the end instead of tracking a running max per line
+        max_similarity = max(pcts) if pcts else 0
+        flag_at = threshold * 100
+        flagged = [
+            {"detail": line.strip().decode("utf-8", "replace"), "score": pct}
+            for pct, line in zip(pcts, matched_lines)
+            if pct >= flag_at
+        ][:5]
 
         return {
             "score": max_similarity,
-            "flagged_files": flagged[:5],
-            "passed": max_similarity < threshold * 100,
+            "flagged_files": flagged,
+            "passed": max_similarity < flag_at,
             "detail": f"{max_similarity:.0f}% max similarity vs corpus",
         }
 
@@ -97,64 +128,410 @@ def layer1_copydetect(source_dir: str, reference_dir: str, threshold: float = 0.
 
 
 # =============================================================================
-# LAYER 3: GitHub Code Search API — Internet-Scale Search
+# SHARED SOURCE ANALYSIS — each Python file is read and parsed once for L3/L4
 # =============================================================================
 
-def _extract_unique_functions(source_dir: str, max_functions: int = 5) -> list:
-    """Extract the most unique function signatures from Python files."""
-    functions = []
+# Below this many files the analysis runs inline. A file takes ~3-4 ms to
+# analyse, while starting spawn workers (each re-importing this module and
+# numpy) costs ~0.3-0.6 s, so with 4 workers the pool only breaks even at
+# around 200-250 files; CI evaluates each repo in a fresh process, so that
+# start-up is never amortised
+_PARALLEL_MIN_FILES = 256
+
+# Files larger than this are memory-mapped rather than read into memory
+_MMAP_MIN_BYTES = 64 * 1024
+
+# Bump whenever the shape or meaning of a per-file analysis changes,
+# so stale cache entries from older runs are never read back
+_ANALYSIS_CACHE_VERSION = 4
+
+
+# Worker pool shared by every analysis in this process, created on first use
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared worker pool, starting it on first use.
+
+    Reusing one pool means worker start-up is paid once per process rather
+    than once per call, which only pays off for batch callers checking many
+    repos in one process. It is opt-in: set $PBL_WORKERS to the number of
+    workers (0 means one per CPU). Unset, analysis runs inline, since a
+    single evaluate.py run never reuses the pool.
+
+    Returns:
+        The pool, or None when the pool is disabled or only one worker is configured
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            try:
+                workers = int(os.environ.get("PBL_WORKERS") or 1) or os.cpu_count() or 1
+            except ValueError:
+                workers = 1
+            if workers <= 1:
+                return None  # A single worker only adds IPC; analyse inline
+            # spawn, not fork: the evaluator runs checks on threads, and forking
+            # a threaded process can deadlock the children
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _POOL
+
+
+def _shutdown_pool():
+    """Stop the shared worker pool (if running) without waiting for it."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pool)
 
-    for root, _, files in os.walk(source_dir):
-        rel_root = os.path.relpath(root, source_dir)
-        if any(part.startswith(".") or part == "__pycache__" for part in rel_root.split(os.sep) if part != "."):
+
+def _analysis_cache_dir() -> str:
+    """
+    Directory for cached per-file analyses, keyed by source hash.
+
+    Lives under $PBL_CACHE_DIR, defaulting to the user cache directory
+    ($XDG_CACHE_HOME or ~/.cache, under pbl-guardian). Never inside the
+    checkout being evaluated: cached entries are trusted as-is, so a student
+    could otherwise commit fake ones. Set $PBL_CACHE_DIR to an empty string
+    to disable caching. Returns None when caching is unavailable.
+    """
+    cache_root = os.environ.get("PBL_CACHE_DIR")
+    if cache_root is None:
+        user_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_root = os.path.join(user_cache, "pbl-guardian")
+    if not cache_root:
+        return None
+    # Keyed by interpreter too: the AST (and so the analysis) of the same
+    # source can differ between Python versions
+    python = f"py{sys.version_info[0]}.{sys.version_info[1]}"
+    cache_dir = os.path.join(cache_root, "ast_metrics", f"v{_ANALYSIS_CACHE_VERSION}", python)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return cache_dir
+
+
+def _is_cached_analysis(analysis) -> bool:
+    """Check that a loaded cache entry has every counter and well-formed snippets."""
+    return (
+        isinstance(analysis, dict)
+        and all(type(analysis.get(field)) is int for field in _AI_COUNTER_FIELDS)
+        and isinstance(analysis.get("snippets"), list)
+        and all(
+            isinstance(snippet, dict)
+            and isinstance(snippet.get("name"), str)
+            and isinstance(snippet.get("snippet"), str)
+            for snippet in analysis["snippets"]
+        )
+    )
+
+
+def _analyze_file(filepath: str, rel_path: str, cache_dir: str = None) -> dict:
+    """
+    Read one Python file and return its analysis, reusing a cached result
+    when a file with identical content was analysed on an earlier run.
+
+    Runs in a worker process, so it returns plain counters and snippets
+    rather than the AST (pickling a tree back costs as much as parsing it).
+    """
+    try:
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_MIN_BYTES:
+                # Map large files instead of copying them into a bytes object;
+                # on a cache hit the contents are only ever hashed
+                raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                raw = f.read()
+    except (OSError, ValueError):
+        return None
+
+    try:
+        cache_path = None
+        if cache_dir:
+            key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            cache_path = os.path.join(cache_dir, key + ".json")
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    analysis = json.load(f)
+            except (OSError, ValueError):
+                pass
+            else:
+                # Valid JSON can still have the wrong shape; recompute then
+                if _is_cached_analysis(analysis):
+                    # Same content may live at a different path this time
+                    for snippet in analysis["snippets"]:
+                        snippet["file"] = rel_path
+                    return analysis
+
+        # Decode only on a cache miss (str() accepts the mmap buffer directly)
+        source = str(raw, "utf-8", "ignore")
+    finally:
+        if isinstance(raw, mmap.mmap):
+            raw.close()
+
+    analysis = _summarize_source(source, filepath, rel_path)
+
+    if cache_path:
+        # Write-then-rename so a concurrent reader never sees a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(analysis, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    return analysis
+
+
+class _AIMetricsVisitor:
+    """
+    Collects the L4 style counters in a single traversal.
+
+    Walks the tree iteratively with ast.walk (a recursive ast.NodeVisitor
+    overflows the stack on deeply nested code such as a long elif chain) and
+    dispatches on the node's type through a dict, so each node costs one
+    lookup instead of a chain of isinstance checks.
+    """
+
+    def __init__(self):
+        self.functions = 0
+        self.functions_with_ds = 0
+        self.docstring_lines = 0
+        self.try_except = 0
+        self.blocks = 0
+        self.name_count = 0
+        self.name_len_sum = 0
+        self.long_names = 0
+        self.snake_names = 0
+
+    def visit(self, tree):
+        handlers = _AI_METRIC_HANDLERS
+        for node in ast.walk(tree):
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+
+    def _handle_func(self, node):
+        # Count functions and docstrings
+        self.functions += 1
+        ds = ast.get_docstring(node, clean=False)
+        if ds is not None:
+            self.functions_with_ds += 1
+            self.docstring_lines += ds.count("\n") + 1
+
+    def _handle_try(self, node):
+        # Count try/except blocks
+        self.try_except += 1
+        self.blocks += 1
+
+    def _handle_block(self, node):
+        self.blocks += 1
+
+    def _handle_name(self, node):
+        # Variable name statistics
+        if isinstance(node.ctx, ast.Store):
+            name_len = len(node.id)
+            self.name_count += 1
+            self.name_len_sum += name_len
+            self.long_names += name_len > 15
+            self.snake_names += "_" in node.id
+
+
+# Node type -> _AIMetricsVisitor handler
+_AI_METRIC_HANDLERS = {
+    ast.FunctionDef: _AIMetricsVisitor._handle_func,
+    ast.AsyncFunctionDef: _AIMetricsVisitor._handle_func,
+    ast.Try: _AIMetricsVisitor._handle_try,
+    ast.If: _AIMetricsVisitor._handle_block,
+    ast.For: _AIMetricsVisitor._handle_block,
+    ast.While: _AIMetricsVisitor._handle_block,
+    ast.Name: _AIMetricsVisitor._handle_name,
+}
+
+
+def _summarize_source(source: str, filepath: str, rel_path: str) -> dict:
+    """Parse one file's source and summarise everything L3 and L4 need."""
+    analysis = {
+        "code_lines": 0,
+        "comment_lines": 0,
+        "docstring_lines": 0,
+        "functions": 0,
+        "functions_with_ds": 0,
+        "try_except": 0,
+        "blocks": 0,
+        "name_count": 0,
+        "name_len_sum": 0,
+        "long_names": 0,
+        "snake_names": 0,
+        "snippets": [],
+    }
+
+    # Count comments and code lines. A plain loop over local counters; the
+    # multiline-regex findall alternative benchmarked ~2.5x slower, since
+    # "^" under re.M is retried at every character rather than every line
+    comment_lines = code_lines = 0
+    for line in source.split("\n"):
+        stripped = line.lstrip()
+        if not stripped:
             continue
-        for fname in files:
-            if not fname.endswith(".py"):
-                continue
-            filepath = os.path.join(root, fname)
+        if stripped[0] == "#":
+            comment_lines += 1
+        else:
+            code_lines += 1
+    analysis["comment_lines"] = comment_lines
+    analysis["code_lines"] = code_lines
+
+    # Deeper analysis needs a parsable AST. Pathologically nested code (e.g. a
+    # single expression with thousands of terms) exhausts the parser's
+    # recursion limit; skip that file's AST metrics rather than the whole run
+    try:
+        tree = ast.parse(source, filename=filepath, type_comments=False)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return analysis
+
+    visitor = _AIMetricsVisitor()
+    visitor.visit(tree)
+    analysis["functions"] = visitor.functions
+    analysis["functions_with_ds"] = visitor.functions_with_ds
+    analysis["docstring_lines"] = visitor.docstring_lines
+    analysis["try_except"] = visitor.try_except
+    analysis["blocks"] = visitor.blocks
+    analysis["name_count"] = visitor.name_count
+    analysis["name_len_sum"] = visitor.name_len_sum
+    analysis["long_names"] = visitor.long_names
+    analysis["snake_names"] = visitor.snake_names
+
+    # L3 search candidates
+    analysis["snippets"] = _extract_funcs_from_file(rel_path, source, tree)
+    return analysis
+
+
+def _analyze_python_sources(source_dir: str) -> dict:
+    """
+    Analyse every Python file under the source directory exactly once.
+
+    Files are fanned out across worker processes when there are enough of
+    them to pay for the pool; unchanged files are served from the on-disk
+    analysis cache.
+
+    Args:
+        source_dir: Student's source code directory
+
+    Returns:
+        dict mapping path (relative to source_dir) -> per-file analysis from _analyze_file
+    """
+    paths = list(iter_py_files(source_dir))
+    rel_paths = [os.path.relpath(p, source_dir) for p in paths]
+
+    cache_dir = _analysis_cache_dir() if paths else None
+
+    analyses = None
+    if len(paths) >= _PARALLEL_MIN_FILES:
+        pool = _get_pool()
+        if pool is not None:
             try:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    source = f.read()
-
-                tree = ast.parse(source)
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        # Get the function body lines
-                        start_line = node.lineno - 1
-                        end_line = node.end_lineno if hasattr(node, "end_lineno") else start_line + 10
-                        lines = source.split("\n")[start_line:end_line]
-
-                        # Skip very short functions (likely trivial)
-                        body_lines = [l for l in lines if l.strip() and not l.strip().startswith("#")]
-                        if len(body_lines) < 4:
-                            continue
-
-                        # Take a 3-5 line snippet for searching
-                        snippet_lines = body_lines[1:6]  # Skip the def line, take implementation
-                        snippet = " ".join(l.strip() for l in snippet_lines)
-
-                        functions.append({
-                            "name": node.name,
-                            "file": os.path.relpath(filepath, source_dir),
-                            "snippet": snippet[:200],  # Limit length
-                            "length": len(body_lines),
-                        })
+                analyses = list(pool.map(
+                    _analyze_file, paths, rel_paths, itertools.repeat(cache_dir), chunksize=4,
+                ))
+            except Exception:
+                # Fall back to analysing inline; a broken pool is rebuilt next time
+                _shutdown_pool()
+                analyses = None
+
+    if analyses is None:
+        analyses = [_analyze_file(p, r, cache_dir) for p, r in zip(paths, rel_paths)]
+
+    return {rel: analysis for rel, analysis in zip(rel_paths, analyses) if analysis is not None}
+
+
+# =============================================================================
+# LAYER 3: GitHub Code Search API — Internet-Scale Search
+# =============================================================================
+
+# Common Python keywords/punctuation that make poor search terms
+_L3_SKIP_TOKENS = frozenset({
+    "self", "return", "if", "else", "for", "in", "def", "class",
+    "import", "from", "not", "and", "or", "True", "False", "None",
+    "=", "==", "!=", "(", ")", "[", "]", "{", "}", ":", ",", ".",
+})
+
+
+# AST fields that hold nested statements (ExceptHandler/match_case wrap their own bodies)
+# Listed in ast's own field order (Try is body, handlers, orelse, finalbody)
+# so the walk below visits nodes in the same order as ast.walk
+_STMT_BODY_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
 
-            except (SyntaxError, UnicodeDecodeError):
+
+def _extract_funcs_from_file(rel_path: str, source: str, tree: ast.AST) -> list:
+    """Extract searchable function snippets from one parsed Python file."""
+    functions = []
+    # Split once per file, not once per function
+    src_lines = source.split("\n")
+
+    # Functions are statements, so only descend through statement bodies
+    # (def/class/if/for/try/with/match) instead of visiting every expression node.
+    # Breadth-first like ast.walk: discovery order breaks ties when ranking snippets
+    queue = deque(tree.body)
+    while queue:
+        node = queue.popleft()
+        for field in _STMT_BODY_FIELDS:
+            queue.extend(getattr(node, field, ()))
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Get the function body lines
+            start_line = node.lineno - 1
+            end_line = node.end_lineno if hasattr(node, "end_lineno") else start_line + 10
+            lines = src_lines[start_line:end_line]
+
+            # Skip very short functions (likely trivial)
+            body_lines = [l for l in lines if l.strip() and not l.strip().startswith("#")]
+            if len(body_lines) < 4:
                 continue
 
-    # Sort by length (longer = more unique) and return top N
-    functions.sort(key=lambda x: x["length"], reverse=True)
-    return functions[:max_functions]
+            # Take a 3-5 line snippet for searching
+            snippet_lines = body_lines[1:6]  # Skip the def line, take implementation
+            snippet = " ".join(l.strip() for l in snippet_lines)
+
+            functions.append({
+                "name": node.name,
+                "file": rel_path,
+                "snippet": snippet[:200],  # Limit length
+                "length": len(body_lines),
+            })
+
+    return functions
+
+
+def _extract_unique_functions(sources: dict, max_functions: int = 5) -> list:
+    """Extract the most unique function signatures from analysed Python sources."""
+    functions = []
 
+    for analysis in sources.values():
+        functions.extend(analysis["snippets"])
 
-def layer3_github_search(source_dir: str, github_token: str = None) -> dict:
+    # Longest functions are the most unique — only the top N are needed, so skip a full sort
+    return heapq.nlargest(max_functions, functions, key=lambda x: x["length"])
+
+
+def layer3_github_search(source_dir: str, github_token: str = None, sources: dict = None) -> dict:
     """
     Search GitHub's public code for matching snippets from student code.
 
     Args:
         source_dir: Student's source code directory
         github_token: GitHub personal access token (from secrets)
+        sources: Per-file analyses from _analyze_python_sources (computed if omitted)
 
     Returns:
         dict with L3 results
@@ -179,7 +556,9 @@ def layer3_github_search(source_dir: str, github_token: str = None) -> dict:
             "detail": "requests library not available — skipped",
         }
 
-    functions = _extract_unique_functions(source_dir)
+    if sources is None:
+        sources = _analyze_python_sources(source_dir)
+    functions = _extract_unique_functions(sources)
     if not functions:
         return {
             "matches_found": 0,
@@ -197,48 +576,47 @@ def layer3_github_search(source_dir: str, github_token: str = None) -> dict:
     matches_found = 0
     flagged = []
 
-    for func in functions[:3]:  # Search top 3 to stay within rate limits
-        # Create a search query from the function's unique code
-        # Use key identifiers from the snippet
-        query_parts = func["snippet"].split()
-        # Take meaningful tokens (skip common Python keywords)
-        skip_tokens = {"self", "return", "if", "else", "for", "in", "def", "class",
-                        "import", "from", "not", "and", "or", "True", "False", "None",
-                        "=", "==", "!=", "(", ")", "[", "]", "{", "}", ":", ",", "."}
-        meaningful = [t for t in query_parts if t not in skip_tokens and len(t) > 2]
-        if len(meaningful) < 3:
-            continue
+    # One keep-alive session so the searches share a single TLS connection.
+    # (Code search is REST-only — GraphQL's search has no CODE type to batch into.)
+    with requests.Session() as session:
+        session.headers.update(headers)
+        for func in functions[:3]:  # Search top 3 to stay within rate limits
+            # Create a search query from the function's unique code
+            # Use key identifiers from the snippet
+            # Take meaningful tokens (skip common Python keywords)
+            meaningful = [t for t in func["snippet"].split() if t not in _L3_SKIP_TOKENS and len(t) > 2]
+            if len(meaningful) < 3:
+                continue
 
-        search_query = " ".join(meaningful[:8]) + " language:python"
+            search_query = " ".join(meaningful[:8]) + " language:python"
 
-        try:
-            resp = requests.get(
-                "https://api.github.com/search/code",
-                params={"q": search_query},
-                headers=headers,
-                timeout=15,
-            )
+            try:
+                resp = session.get(
+                    "https://api.github.com/search/code",
+                    params={"q": search_query},
+                    timeout=15,
+                )
+
+                if resp.status_code == 200:
+                    data = resp.json()
+                    total_count = data.get("total_count", 0)
+
+                    if total_count > 0:
+                        matches_found += 1
+                        top_match = data.get("items", [{}])[0] if data.get("items") else {}
+                        flagged.append({
+                            "function": func["name"],
+                            "file": func["file"],
+                            "github_matches": total_count,
+                            "top_match_repo": top_match.get("repository", {}).get("full_name", "unknown"),
+                            "top_match_file": top_match.get("path", "unknown"),
+                        })
+                elif resp.status_code == 403:
+                    # Rate limited
+                    break
 
-            if resp.status_code == 200:
-                data = resp.json()
-                total_count = data.get("total_count", 0)
-
-                if total_count > 0:
-                    matches_found += 1
-                    top_match = data.get("items", [{}])[0] if data.get("items") else {}
-                    flagged.append({
-                        "function": func["name"],
-                        "file": func["file"],
-                        "github_matches": total_count,
-                        "top_match_repo": top_match.get("repository", {}).get("full_name", "unknown"),
-                        "top_match_file": top_match.get("path", "unknown"),
-                    })
-            elif resp.status_code == 403:
-                # Rate limited
-                break
-
-        except Exception:
-            continue
+            except Exception:
+                continue
 
     total_searched = min(len(functions), 3)
     # Only flag if majority of searched functions have matches (reduces false positives)
@@ -258,7 +636,130 @@ def layer3_github_search(source_dir: str, github_token: str = None) -> dict:
 # LAYER 4: AI Fingerprint Heuristics
 # =============================================================================
 
-def layer4_ai_detection(source_dir: str) -> dict:
+# Per-file counter columns, in the order layer4_ai_detection packs them
+_AI_COUNTER_FIELDS = (
+    "code_lines", "comment_lines", "docstring_lines", "functions", "functions_with_ds",
+    "try_except", "blocks", "name_count", "name_len_sum", "long_names", "snake_names",
+)
+
+# Bits in the flag mask returned by _score_ai_counters
+_AI_FLAG_VERY_HIGH_COMMENTS = 1
+_AI_FLAG_HIGH_COMMENTS = 2
+_AI_FLAG_DOCSTRINGS = 4
+_AI_FLAG_LONG_NAMES = 8
+_AI_FLAG_TRY_DENSITY = 16
+
+
+def _score_ai_counters(counts):
+    """
+    Reduce the per-file counters and apply the L4 heuristics.
+
+    Written in the numba-compatible subset of NumPy so it can be JIT-compiled;
+    flag messages are formatted by the caller from the returned bit mask.
+
+    Args:
+        counts: int64 array of shape (files, len(_AI_COUNTER_FIELDS))
+
+    Returns:
+        (totals, ratios, score_sum, score_count, flag_mask) where ratios holds
+        comment, docstring, average-name-length, long-name and try/except ratios
+    """
+    totals = counts.sum(axis=0)
+    code_lines = totals[0]
+    comment_lines = totals[1]
+    functions = totals[3]
+    functions_with_ds = totals[4]
+    try_except = totals[5]
+    blocks = totals[6]
+    name_count = totals[7]
+
+    ratios = np.zeros(5)
+    score_sum = 0.0
+    score_count = 0
+    flag_mask = 0
+
+    # HEURISTIC 1: Comment-to-code ratio
+    # AI code typically has >35% comment ratio
+    if code_lines > 0:
+        ratios[0] = comment_lines / (code_lines + comment_lines)
+        if ratios[0] > 0.40:
+            score_sum += 0.8
+            flag_mask |= _AI_FLAG_VERY_HIGH_COMMENTS
+        elif ratios[0] > 0.30:
+            score_sum += 0.4
+            flag_mask |= _AI_FLAG_HIGH_COMMENTS
+        else:
+            score_sum += 0.1
+        score_count += 1
+
+    # HEURISTIC 2: Docstring completeness
+    # AI almost always adds docstrings to every function
+    if functions > 2:
+        ratios[1] = functions_with_ds / functions
+        if ratios[1] > 0.90:
+            score_sum += 0.7
+            flag_mask |= _AI_FLAG_DOCSTRINGS
+        elif ratios[1] > 0.70:
+            score_sum += 0.3
+        else:
+            score_sum += 0.1
+        score_count += 1
+
+    # HEURISTIC 3: Variable naming uniformity
+    # AI uses long, descriptive variable names consistently
+    if name_count > 0:
+        ratios[2] = totals[8] / name_count
+        ratios[3] = totals[9] / name_count
+
+        # AI tends to have very uniform naming
+        if ratios[2] > 12 and ratios[3] > 0.3:
+            score_sum += 0.6
+            flag_mask |= _AI_FLAG_LONG_NAMES
+        else:
+            score_sum += 0.1
+        score_count += 1
+
+    # HEURISTIC 4: Error handling density
+    # AI wraps everything in try/except
+    if blocks > 3:
+        ratios[4] = try_except / blocks
+        if ratios[4] > 0.5:
+            score_sum += 0.6
+            flag_mask |= _AI_FLAG_TRY_DENSITY
+        else:
+            score_sum += 0.1
+        score_count += 1
+
+    return totals, ratios, score_sum, score_count, flag_mask
+
+
+@lru_cache(maxsize=1)
+def _ai_scorer():
+    """
+    Return _score_ai_counters, JIT-compiled with numba when opted in.
+
+    numba is an optional extra (not in requirements.txt) and is only used
+    when $PBL_NUMBA=1: a cold compile takes seconds against well under a
+    millisecond to score one repo in pure Python, and CI starts from a fresh
+    checkout, so the on-disk compile cache never carries over. It only pays
+    off for long batch runs.
+    """
+    if os.environ.get("PBL_NUMBA") != "1":
+        return _score_ai_counters
+    try:
+        import numba
+        scorer = numba.njit(cache=True)(_score_ai_counters)
+        # Compile (or load from the on-disk cache) now, so a failure here
+        # falls back cleanly instead of surfacing mid-evaluation
+        scorer(np.zeros((1, len(_AI_COUNTER_FIELDS)), dtype=np.int64))
+        return scorer
+    except Exception:
+        # numba missing, no writable cache dir, or a cache entry written
+        # while this module was imported under a different name
+        return _score_ai_counters
+
+
+def layer4_ai_detection(source_dir: str, sources: dict = None) -> dict:
     """
     Detect patterns commonly found in AI-generated code.
 
@@ -269,31 +770,17 @@ def layer4_ai_detection(source_dir: str) -> dict:
     - Error handling density (AI wraps everything in try/except)
     - Import style (AI uses textbook ordering)
 
+    Args:
+        source_dir: Student's source code directory
+        sources: Per-file analyses from _analyze_python_sources (computed if omitted)
+
     Returns:
         dict with AI detection results (score 0-1, higher = more likely AI)
     """
-    scores = []
-    flags = []
-
-    total_code_lines = 0
-    total_comment_lines = 0
-    total_docstring_lines = 0
-    total_functions = 0
-    functions_with_docstrings = 0
-    variable_names = []
-    try_except_count = 0
-    total_blocks = 0
-
-    py_files = []
-    for root, _, files in os.walk(source_dir):
-        rel_root = os.path.relpath(root, source_dir)
-        if any(part.startswith(".") or part == "__pycache__" for part in rel_root.split(os.sep) if part != "."):
-            continue
-        for f in files:
-            if f.endswith(".py"):
-                py_files.append(os.path.join(root, f))
+    if sources is None:
+        sources = _analyze_python_sources(source_dir)
 
-    if not py_files:
+    if not sources:
         return {
             "ai_score": 0.0,
             "flags": [],
@@ -304,109 +791,32 @@ def layer4_ai_detection(source_dir: str) -> dict:
             "detail": "No Python files to analyze",
         }
 
-    for filepath in py_files:
-        try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                source = f.read()
-                lines = source.split("\n")
-
-            # Count comments and code lines
-            for line in lines:
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                if stripped.startswith("#"):
-                    total_comment_lines += 1
-                else:
-                    total_code_lines += 1
-
-            # Parse AST for deeper analysis
-            try:
-                tree = ast.parse(source)
-            except SyntaxError:
-                continue
-
-            for node in ast.walk(tree):
-                # Count functions and docstrings
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    total_functions += 1
-                    # Check for docstring
-                    if (node.body and isinstance(node.body[0], ast.Expr)
-                            and isinstance(node.body[0].value, (ast.Constant, ast.Str))):
-                        functions_with_docstrings += 1
-                        # Count docstring lines
-                        if isinstance(node.body[0].value, ast.Constant):
-                            ds = str(node.body[0].value.value)
-                        else:
-                            ds = node.body[0].value.s
-                        total_docstring_lines += len(ds.split("\n"))
-
-                # Count try/except blocks
-                if isinstance(node, ast.Try):
-                    try_except_count += 1
-                    total_blocks += 1
-                elif isinstance(node, (ast.If, ast.For, ast.While)):
-                    total_blocks += 1
-
-                # Collect variable names
-                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
-                    variable_names.append(node.id)
-
-        except Exception:
-            continue
-
-    # HEURISTIC 1: Comment-to-code ratio
-    # AI code typically has >35% comment ratio
-    if total_code_lines > 0:
-        comment_ratio = total_comment_lines / (total_code_lines + total_comment_lines)
-        if comment_ratio > 0.40:
-            scores.append(0.8)
-            flags.append(f"Very high comment ratio: {comment_ratio:.0%} (AI typical: >40%)")
-        elif comment_ratio > 0.30:
-            scores.append(0.4)
-            flags.append(f"High comment ratio: {comment_ratio:.0%}")
-        else:
-            scores.append(0.1)
-
-    # HEURISTIC 2: Docstring completeness
-    # AI almost always adds docstrings to every function
-    if total_functions > 2:
-        docstring_ratio = functions_with_docstrings / total_functions
-        if docstring_ratio > 0.90:
-            scores.append(0.7)
-            flags.append(f"Near-perfect docstring coverage: {docstring_ratio:.0%}")
-        elif docstring_ratio > 0.70:
-            scores.append(0.3)
-        else:
-            scores.append(0.1)
-
-    # HEURISTIC 3: Variable naming uniformity
-    # AI uses long, descriptive variable names consistently
-    if variable_names:
-        avg_name_length = sum(len(n) for n in variable_names) / len(variable_names)
-        long_name_ratio = sum(1 for n in variable_names if len(n) > 15) / len(variable_names)
-        snake_case_ratio = sum(1 for n in variable_names if "_" in n) / len(variable_names)
+    # Pack the per-file partial counters into one array and reduce/score it
+    counts = np.fromiter(
+        (analysis[field] for analysis in sources.values() for field in _AI_COUNTER_FIELDS),
+        dtype=np.int64,
+        count=len(sources) * len(_AI_COUNTER_FIELDS),
+    ).reshape(len(sources), len(_AI_COUNTER_FIELDS))
+    totals, ratios, score_sum, score_count, flag_mask = _ai_scorer()(counts)
+    (total_code_lines, total_comment_lines, _, total_functions, functions_with_docstrings,
+     try_except_count, total_blocks, name_count, name_len_sum, _, _) = totals.tolist()
+    comment_ratio, docstring_ratio, avg_name_length, long_name_ratio, error_ratio = ratios.tolist()
 
-        # AI tends to have very uniform naming
-        if avg_name_length > 12 and long_name_ratio > 0.3:
-            scores.append(0.6)
-            flags.append(f"Unusually long variable names: avg {avg_name_length:.1f} chars, "
-                        f"{long_name_ratio:.0%} are >15 chars")
-        else:
-            scores.append(0.1)
-
-    # HEURISTIC 4: Error handling density
-    # AI wraps everything in try/except
-    if total_blocks > 3:
-        error_ratio = try_except_count / total_blocks
-        if error_ratio > 0.5:
-            scores.append(0.6)
-            flags.append(f"High try/except density: {error_ratio:.0%} of blocks")
-        else:
-            scores.append(0.1)
+    flags = []
+    if flag_mask & _AI_FLAG_VERY_HIGH_COMMENTS:
+        flags.append(f"Very high comment ratio: {comment_ratio:.0%} (AI typical: >40%)")
+    elif flag_mask & _AI_FLAG_HIGH_COMMENTS:
+        flags.append(f"High comment ratio: {comment_ratio:.0%}")
+    if flag_mask & _AI_FLAG_DOCSTRINGS:
+        flags.append(f"Near-perfect docstring coverage: {docstring_ratio:.0%}")
+    if flag_mask & _AI_FLAG_LONG_NAMES:
+        flags.append(f"Unusually long variable names: avg {avg_name_length:.1f} chars, "
+                     f"{long_name_ratio:.0%} are >15 chars")
+    if flag_mask & _AI_FLAG_TRY_DENSITY:
+        flags.append(f"High try/except density: {error_ratio:.0%} of blocks")
 
     # Calculate final AI score (weighted average)
-    ai_score = round(sum(scores) / len(scores), 2) if scores else 0.0
+    ai_score = round(float(score_sum) / score_count, 2) if score_count else 0.0
 
     # Determine status
     if ai_score >= 0.6:
@@ -429,7 +839,7 @@ def layer4_ai_detection(source_dir: str) -> dict:
         "metrics": {
             "comment_ratio": round(total_comment_lines / max(total_code_lines + total_comment_lines, 1), 2),
             "docstring_ratio": round(functions_with_docstrings / max(total_functions, 1), 2),
-            "avg_var_name_length": round(sum(len(n) for n in variable_names) / max(len(variable_names), 1), 1),
+            "avg_var_name_length": round(name_len_sum / max(name_count, 1), 1),
             "try_except_ratio": round(try_except_count / max(total_blocks, 1), 2),
         },
         "status": f"{status_emoji} AI Score: {ai_score} ({status_label})",
@@ -443,6 +853,86 @@ def layer4_ai_detection(source_dir: str) -> dict:
 # LAYER 5: Commit Behavior Analysis
 # =============================================================================
 
+# ASCII Unit Separator between git log format fields — unlike a pipe, it
+# never appears in commit messages
+_SEP = "\x1f"
+
+
+def _commits_from_git_log() -> list:
+    """
+    Read commit stats by parsing `git log --numstat` output.
+
+    Returns:
+        list of commit dicts (date parsed to a datetime, or None), or None if git could not be run
+    """
+    commits = []
+    current_commit = None
+
+    try:
+        # Get commit history with stats, streamed so parsing overlaps with git
+        # producing output and the full log is never held in memory
+        proc = subprocess.Popen(
+            ["git", "log", "--all", "--no-merges",
+             f"--format=%H{_SEP}%aN{_SEP}%aI{_SEP}%s", "--numstat"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1 << 20,
+        )
+        # Enforce the 30 s cap on git log while streaming: the timer kills
+        # git, which ends the read loop at EOF
+        timer = threading.Timer(30, proc.kill)
+        timer.start()
+        try:
+            with proc:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    if _SEP in line:
+                        # New commit header (unit separator is never in user content)
+                        parts = line.split(_SEP, 3)
+                        if len(parts) == 4:
+                            if current_commit:
+                                commits.append(current_commit)
+                            # Parse the date here, so later checks never rescan the commits
+                            try:
+                                date = datetime.fromisoformat(parts[2])
+                            except ValueError:
+                                date = None
+                            current_commit = {
+                                "sha": parts[0],
+                                "author": parts[1],
+                                "date": date,
+                                "message": parts[3],
+                                "additions": 0,
+                                "deletions": 0,
+                            }
+                    elif current_commit and "\t" in line:
+                        tab_parts = line.split("\t")
+                        if len(tab_parts) == 3:
+                            try:
+                                added = int(tab_parts[0]) if tab_parts[0] != "-" else 0
+                                deleted = int(tab_parts[1]) if tab_parts[1] != "-" else 0
+                                current_commit["additions"] += added
+                                current_commit["deletions"] += deleted
+                            except ValueError:
+                                pass
+        finally:
+            timer.cancel()
+        if proc.returncode < 0:
+            # Killed on timeout — the log is incomplete
+            return None
+    except Exception:
+        return None
+
+    if current_commit:
+        commits.append(current_commit)
+
+    return commits
+
+
 def layer5_commit_patterns(max_dump_lines: int = 200) -> dict:
     """
     Analyze git commit patterns for suspicious behavior.
@@ -456,18 +946,8 @@ def layer5_commit_patterns(max_dump_lines: int = 200) -> dict:
     Returns:
         dict with commit pattern analysis results
     """
-    try:
-        # Get commit history with stats
-        # Use ASCII Unit Separator (\x1f) instead of pipe — commit messages can contain pipes
-        SEP = "\x1f"
-        result = subprocess.run(
-            ["git", "log", "--all", "--no-merges",
-             f"--format=%H{SEP}%aN{SEP}%aI{SEP}%s", "--numstat"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-    except Exception:
+    commits = _commits_from_git_log()
+    if commits is None:
         return {
             "passed": True,
             "flags": [],
@@ -476,43 +956,6 @@ def layer5_commit_patterns(max_dump_lines: int = 200) -> dict:
             "status_emoji": "⚠️",
         }
 
-    commits = []
-    current_commit = None
-    SEP = "\x1f"
-
-    for line in result.stdout.strip().split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        if SEP in line:
-            # New commit header (unit separator is never in user content)
-            parts = line.split(SEP, 3)
-            if len(parts) == 4:
-                if current_commit:
-                    commits.append(current_commit)
-                current_commit = {
-                    "sha": parts[0],
-                    "author": parts[1],
-                    "date": parts[2],
-                    "message": parts[3],
-                    "additions": 0,
-                    "deletions": 0,
-                }
-        elif current_commit and "\t" in line:
-            tab_parts = line.split("\t")
-            if len(tab_parts) == 3:
-                try:
-                    added = int(tab_parts[0]) if tab_parts[0] != "-" else 0
-                    deleted = int(tab_parts[1]) if tab_parts[1] != "-" else 0
-                    current_commit["additions"] += added
-                    current_commit["deletions"] += deleted
-                except ValueError:
-                    pass
-
-    if current_commit:
-        commits.append(current_commit)
-
     if not commits:
         return {
             "passed": True,
@@ -533,21 +976,18 @@ def layer5_commit_patterns(max_dump_lines: int = 200) -> dict:
             )
 
     # CHECK 2: Last-minute rush — >60% of code in final 25% of project timeline
-    commit_dates = []
-    for c in commits:
-        try:
-            dt = datetime.fromisoformat(c["date"])
-            commit_dates.append((dt, c["additions"]))
-        except (ValueError, TypeError):
-            pass
+    commit_dates = [(c["date"], c["additions"]) for c in commits if c["date"] is not None]
 
     if len(commit_dates) > 3:
-        commit_dates.sort(key=lambda x: x[0])
-        total_span = (commit_dates[-1][0] - commit_dates[0][0]).total_seconds()
+        # Vectorised over epoch seconds; min/max bound the span, so no sort is needed
+        ts = np.fromiter((dt.timestamp() for dt, _ in commit_dates), dtype=np.float64, count=len(commit_dates))
+        adds = np.fromiter((a for _, a in commit_dates), dtype=np.int64, count=len(commit_dates))
+        first_ts = ts.min()
+        total_span = ts.max() - first_ts
         if total_span > 0:
-            cutoff_time = commit_dates[0][0] + timedelta(seconds=total_span * 0.75)
-            total_additions = sum(a for _, a in commit_dates)
-            late_additions = sum(a for dt, a in commit_dates if dt >= cutoff_time)
+            cutoff_ts = first_ts + total_span * 0.75
+            total_additions = int(adds.sum())
+            late_additions = int(adds[ts >= cutoff_ts].sum())
 
             if total_additions > 0:
                 late_ratio = late_additions / total_additions
@@ -621,23 +1061,34 @@ def check_plagiarism(
 
     results = {}
 
-    # Layer 1: Copydetect vs reference corpus
-    results["L1_copydetect"] = layer1_copydetect(source_dir, reference_dir, threshold)
+    # The layers are independent and mostly wait on subprocesses or the network,
+    # so run them concurrently; only L3 and L4 need the parsed sources first
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        l1_future = executor.submit(layer1_copydetect, source_dir, reference_dir, threshold)
+        l5_future = executor.submit(layer5_commit_patterns)
 
-    # Layer 2: JPlag (runs via separate weekly workflow — just note it here)
-    results["L2_jplag"] = {
-        "detail": "Runs via weekly scheduled workflow",
-        "passed": True,
-    }
+        # Read, parse and summarise the student's Python files once for L3 and L4
+        sources = _analyze_python_sources(source_dir)
+        l3_future = executor.submit(layer3_github_search, source_dir, github_token, sources)
+        l4_future = executor.submit(layer4_ai_detection, source_dir, sources)
+
+        # Layer 1: Copydetect vs reference corpus
+        results["L1_copydetect"] = l1_future.result()
+
+        # Layer 2: JPlag (runs via separate weekly workflow — just note it here)
+        results["L2_jplag"] = {
+            "detail": "Runs via weekly scheduled workflow",
+            "passed": True,
+        }
 
-    # Layer 3: GitHub Code Search
-    results["L3_github_search"] = layer3_github_search(source_dir, github_token)
+        # Layer 3: GitHub Code Search
+        results["L3_github_search"] = l3_future.result()
 
-    # Layer 4: AI Detection Heuristics
-    results["L4_ai_detection"] = layer4_ai_detection(source_dir)
+        # Layer 4: AI Detection Heuristics
+        results["L4_ai_detection"] = l4_future.result()
 
-    # Layer 5: Commit Behavior Analysis
-    results["L5_commit_patterns"] = layer5_commit_patterns()
+        # Layer 5: Commit Behavior Analysis
+        results["L5_commit_patterns"] = l5_future.result()
 
     # Aggregate results
     all_passed = all(r.get("passed", True) for r in results.values())
@@ -9,8 +9,36 @@ import re
 import subprocess
 
 
-IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".svg"}
-DOC_EXTENSIONS = {".md", ".txt", ".pdf", ".doc", ".docx"}
+# Bare, lowercase extensions (no leading dot)
+IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "bmp", "webp", "svg"})
+DOC_EXTENSIONS = frozenset({"md", "txt", "pdf", "doc", "docx"})
+
+# Changes under these paths are tooling/config, not source code
+_NON_CODE_PREFIXES = (".pbl/", ".github/", "scripts/")
+
+
+def _count_proof_files(proof_dir: str) -> int:
+    """
+    Count the files under the proofs directory, ignoring .gitkeep placeholders.
+
+    Walks with os.scandir so each entry is classified from the directory
+    listing itself; symlinked directories are not followed (as with os.walk).
+    """
+    count = 0
+    stack = [proof_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                elif entry.name != ".gitkeep":
+                    count += 1
+    return count
 
 
 def check_proofs(proof_dir: str = "proofs", commit_sha: str = "HEAD") -> dict:
@@ -24,69 +52,54 @@ def check_proofs(proof_dir: str = "proofs", commit_sha: str = "HEAD") -> dict:
     Returns:
         dict with proof evaluation results
     """
-    # Get files changed in this commit
+    # Get files changed in this commit — NUL-delimited (-z), so paths come
+    # back verbatim: no quoting of unusual names, no newline ambiguity
     try:
         result = subprocess.run(
-            ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_sha],
+            ["git", "diff-tree", "--no-commit-id", "--name-only", "-z", "-r", commit_sha],
             capture_output=True,
-            text=True,
             timeout=30,
         )
-        changed_files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
+        changed_files = [os.fsdecode(f) for f in result.stdout.split(b"\x00") if f]
     except Exception:
         changed_files = []
 
-    # Filter for files in the proofs directory
-    proof_files_in_commit = [
-        f for f in changed_files
-        if f.startswith(proof_dir.rstrip("/") + "/")
-    ]
+    proof_prefix = proof_dir.rstrip("/") + "/"
 
-    # Also check what's in the proofs directory overall
-    all_proofs = []
-    if os.path.isdir(proof_dir):
-        for root, _, files in os.walk(proof_dir):
-            for f in files:
-                if f == ".gitkeep":
-                    continue
-                filepath = os.path.join(root, f)
-                ext = os.path.splitext(f)[1].lower()
-                all_proofs.append({
-                    "file": os.path.relpath(filepath, proof_dir),
-                    "type": "screenshot" if ext in IMAGE_EXTENSIONS else "document" if ext in DOC_EXTENSIONS else "other",
-                    "extension": ext,
-                })
-
-    # Categorize new proofs in this commit
+    # One pass over the changed files: pick out and categorize new proofs,
+    # and note whether any source code changed alongside them
+    proof_files_in_commit = []
     new_screenshots = []
     new_documents = []
     new_other = []
+    code_changed = False
+
+    for f in changed_files:
+        if f.startswith(proof_prefix):
+            proof_files_in_commit.append(f)
+            # git always reports paths with "/" separators
+            basename = f.rpartition("/")[2]
+            if basename == ".gitkeep":
+                continue
+            # Same rule as os.path.splitext: leading dots don't start an extension
+            stem, _, ext = basename.rpartition(".")
+            ext = ext.lower() if stem.lstrip(".") else ""
+            if ext in IMAGE_EXTENSIONS:
+                new_screenshots.append(f)
+            elif ext in DOC_EXTENSIONS:
+                new_documents.append(f)
+            else:
+                new_other.append(f)
+        elif not f.startswith(_NON_CODE_PREFIXES):
+            code_changed = True
 
-    for f in proof_files_in_commit:
-        ext = os.path.splitext(f)[1].lower()
-        basename = os.path.basename(f)
-        if basename == ".gitkeep":
-            continue
-        if ext in IMAGE_EXTENSIONS:
-            new_screenshots.append(f)
-        elif ext in DOC_EXTENSIONS:
-            new_documents.append(f)
-        else:
-            new_other.append(f)
+    # Also check what's in the proofs directory overall
+    total_proofs = _count_proof_files(proof_dir)
 
     has_screenshots = len(new_screenshots) > 0
     has_progress_log = len(new_documents) > 0
     has_any_proof = has_screenshots or has_progress_log or len(new_other) > 0
 
-    # Check if source code was also changed (proofs should accompany code changes)
-    code_changed = any(
-        not f.startswith(proof_dir.rstrip("/") + "/")
-        and not f.startswith(".pbl/")
-        and not f.startswith(".github/")
-        and not f.startswith("scripts/")
-        for f in changed_files
-    )
-
     # Determine pass/fail
     # If code was changed but no proofs were added, flag it
     if code_changed and not has_any_proof:
@@ -116,7 +129,7 @@ def check_proofs(proof_dir: str = "proofs", commit_sha: str = "HEAD") -> dict:
         "new_proofs": proof_files_in_commit,
         "new_screenshots_count": len(new_screenshots),
         "new_documents_count": len(new_documents),
-        "total_proofs_in_repo": len(all_proofs),
+        "total_proofs_in_repo": total_proofs,
         "code_changed": code_changed,
         "status": status,
         "status_emoji": status_emoji,
@@ -8,6 +8,11 @@ import os
 import subprocess
 import sys
 
+try:
+    from .file_utils import iter_py_files
+except ImportError:  # Run as a plain script with scripts/ on sys.path (evaluate.py)
+    from file_utils import iter_py_files
+
 
 def check_quality(source_dir: str, language: str = "python", min_score: float = 7.0) -> dict:
     """
@@ -32,14 +37,7 @@ def check_quality(source_dir: str, language: str = "python", min_score: float =
         }
 
     # Find all Python files
-    py_files = []
-    for root, _, files in os.walk(source_dir):
-        # Skip hidden directories and __pycache__
-        if any(part.startswith(".") or part == "__pycache__" for part in root.split(os.sep)):
-            continue
-        for f in files:
-            if f.endswith(".py"):
-                py_files.append(os.path.join(root, f))
+    py_files = list(iter_py_files(source_dir))
 
     if not py_files:
         return {
@@ -60,6 +58,7 @@ def check_quality(source_dir: str, language: str = "python", min_score: float =
                 "--disable=C0114,C0115,C0116",  # Disable missing docstring warnings
                 "--max-line-length=120",
                 "--score=y",
+                "--jobs=0",  # One pylint worker per CPU
                 *py_files,
             ],
             capture_output=True,
@@ -76,15 +75,15 @@ def check_quality(source_dir: str, language: str = "python", min_score: float =
         if pylint_output:
             try:
                 parsed = json.loads(pylint_output)
+            except json.JSONDecodeError:
+                parsed = None
+            if isinstance(parsed, dict):
                 issues_raw = parsed.get("messages", [])
                 # Extract score from statistics
                 score = parsed.get("statistics", {}).get("score", 0.0)
-            except (json.JSONDecodeError, AttributeError):
-                # Fallback: try legacy json format
-                try:
-                    issues_raw = json.loads(pylint_output)
-                except json.JSONDecodeError:
-                    issues_raw = []
+            elif isinstance(parsed, list):
+                # Legacy json format: a bare list of messages, no score
+                issues_raw = parsed
 
         # If score wasn't in JSON, try parsing stderr for the rating line
         if score == 0.0:
@@ -139,7 +138,6 @@ def check_quality(source_dir: str, language: str = "python", min_score: float =
 
 
 if __name__ == "__main__":
-    import sys as _sys
-    src = _sys.argv[1] if len(_sys.argv) > 1 else "./src"
+    src = sys.argv[1] if len(sys.argv) > 1 else "./src"
     result = check_quality(src)
     print(json.dumps(result, indent=2))
@@ -4,11 +4,169 @@ Evaluates whether a commit falls within milestone deadlines and class days.
 """
 
 import json
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import cached_property, lru_cache
 from zoneinfo import ZoneInfo
 
+import numpy as np
 
-def check_timing(config: dict, commit_timestamp_iso: str) -> dict:
+
+# Day names indexed by datetime.weekday() — a tuple lookup instead of strftime("%A")
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_WEEKDAY_INDEX = {day.lower(): i for i, day in enumerate(_WEEKDAYS)}
+
+# (status, status_emoji) indexed by (is_late << 1) | is_class_day
+_STATUS_TABLE = (
+    ("✅ On Time", "✅"),              # on time, not a class day
+    ("✅ On Time (Class Day)", "✅"),  # on time, class day
+    ("❌ Late", "❌"),                 # late, not a class day
+    ("❌ Late", "❌"),                 # late, class day
+)
+
+# Mapping keys of a TimingResult, in report order
+_RESULT_KEYS = (
+    "passed", "is_class_day", "is_within_milestone", "is_late",
+    "current_phase", "days_until_deadline", "commit_day",
+    "commit_local_time", "status", "status_emoji", "detail",
+)
+
+
+@dataclass(frozen=True, eq=False)
+class TimingResult(Mapping):
+    """
+    Immutable timing evaluation result.
+
+    Behaves as a read-only mapping (result["passed"], .get(), dict(result))
+    so existing dict consumers keep working; compares equal to a dict with
+    the same items. The status, detail and commit_local_time strings are
+    only formatted when first read, so callers that just check "passed"
+    never build them.
+    """
+
+    is_class_day: bool
+    is_within_milestone: bool
+    is_late: bool
+    current_phase: str | None
+    days_until_deadline: int | None
+    commit_day: str
+    commit_local: datetime
+
+    @property
+    def passed(self) -> bool:
+        return not self.is_late
+
+    @cached_property
+    def commit_local_time(self) -> str:
+        return self.commit_local.isoformat()
+
+    @property
+    def _status_entry(self) -> tuple:
+        return _STATUS_TABLE[(self.is_late << 1) | self.is_class_day]
+
+    @cached_property
+    def status(self) -> str:
+        return self._status_entry[0]
+
+    @cached_property
+    def status_emoji(self) -> str:
+        return self._status_entry[1]
+
+    @cached_property
+    def detail(self) -> str:
+        days = self.days_until_deadline
+        if days is not None and days >= 0:
+            return f"{self.current_phase} — {days} days before deadline"
+        if days is not None:
+            return f"{self.current_phase} — {abs(days)} days past deadline"
+        return self.current_phase or "No milestone configured"
+
+    def __getitem__(self, key):
+        if key in _RESULT_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_RESULT_KEYS)
+
+    def __len__(self):
+        return len(_RESULT_KEYS)
+
+
+# Zone names that are plain UTC (upper-cased); these map to the
+# datetime.timezone.utc singleton, which fromisoformat also attaches to
+# "Z"/"+00:00" timestamps
+_UTC_NAMES = frozenset({
+    "UTC", "ETC/UTC", "ETC/UCT", "UCT", "UNIVERSAL", "ETC/UNIVERSAL", "ZULU", "ETC/ZULU", "Z",
+})
+
+
+@lru_cache(maxsize=64)
+def _get_zone(name: str):
+    """Return the tzinfo for a timezone name, built once per name."""
+    # Matched case-insensitively: ZoneInfo lookups are case-insensitive only on
+    # case-insensitive filesystems, so "utc" would otherwise work on macOS but not Linux
+    if name.upper() in _UTC_NAMES:
+        return timezone.utc
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=64)
+def _prepare_class_days(class_days: tuple) -> int:
+    """Class days as a 7-bit mask (bit 0 = Monday), built once per config."""
+    mask = 0
+    for day in class_days:
+        index = _WEEKDAY_INDEX.get(day.lower())
+        if index is not None:
+            mask |= 1 << index
+    return mask
+
+
+@lru_cache(maxsize=64)
+def _prepare_milestones(tz_name: str, grace_hours: float, milestones: tuple) -> tuple:
+    """
+    Parse a config's milestones once into parallel sequences of UTC instants.
+
+    Args:
+        tz_name: Team timezone name
+        grace_hours: Grace period after each deadline
+        milestones: ((phase, "YYYY-MM-DD"), ...) in config order
+
+    Returns:
+        (deadlines_utc, deadlines_with_grace_utc, deadline_dates, phase_names)
+        tuples, sorted chronologically so a commit's phase can be found by
+        bisection
+    """
+    tz = _get_zone(tz_name)
+    grace = timedelta(hours=grace_hours)
+    parsed = []
+
+    for phase, deadline_str in milestones:
+        try:
+            # C fast path for the usual zero-padded YYYY-MM-DD
+            deadline_date = date.fromisoformat(deadline_str)
+        except ValueError:
+            # strptime also accepts unpadded forms such as 2026-3-1
+            deadline_date = datetime.strptime(deadline_str, "%Y-%m-%d").date()
+        parsed.append((deadline_date, phase))
+
+    # Stable sort: milestones sharing a deadline keep their config order
+    parsed.sort(key=lambda item: item[0])
+    deadlines_utc = []
+    deadlines_with_grace_utc = []
+    for deadline_date, _ in parsed:
+        deadline_local = datetime.combine(deadline_date, time.min, tzinfo=tz)
+        deadlines_utc.append(deadline_local.astimezone(timezone.utc))
+        # Grace is added on the local wall clock, as before, then anchored to UTC
+        deadlines_with_grace_utc.append((deadline_local + grace).astimezone(timezone.utc))
+    deadline_dates = tuple(deadline_date for deadline_date, _ in parsed)
+    phase_names = tuple(phase for _, phase in parsed)
+    return tuple(deadlines_utc), tuple(deadlines_with_grace_utc), deadline_dates, phase_names
+
+
+def check_timing(config: dict, commit_timestamp_iso: str) -> TimingResult:
     """
     Check if the commit was made on time relative to milestones and class days.
 
@@ -17,95 +175,180 @@ def check_timing(config: dict, commit_timestamp_iso: str) -> dict:
         commit_timestamp_iso: ISO 8601 timestamp of the commit (UTC)
 
     Returns:
-        dict with timing evaluation results
+        TimingResult with timing evaluation results
+    """
+    return make_timing_checker(config)(commit_timestamp_iso)
+
+
+def make_timing_checker(config: dict):
     """
-    timezone = ZoneInfo(config.get("timezone", "Asia/Kolkata"))
+    Specialise the timing check to one config.
+
+    The timezone, class days and milestones are resolved once and bound into
+    the returned closure, so evaluating many commits against the same config
+    only pays for parsing and bisecting each timestamp. Closures are cached
+    per distinct config, so repeated check_timing calls reuse them.
+
+    Args:
+        config: The .pbl/config.json contents
+
+    Returns:
+        function mapping an ISO 8601 commit timestamp to a TimingResult
+    """
+    return _build_timing_checker(
+        config.get("timezone", "Asia/Kolkata"),
+        config.get("grace_period_hours", 2),
+        tuple(config.get("class_days", ())),
+        tuple((m["phase"], m["deadline"]) for m in config.get("milestones", [])),
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_timing_checker(tz_name: str, grace_hours: float, class_days: tuple, milestones: tuple):
+    """Build make_timing_checker's closure for one prepared config."""
+    tz = _get_zone(tz_name)
+    class_days = _prepare_class_days(class_days)
+    deadlines, deadlines_with_grace, deadline_dates, phase_names = _prepare_milestones(
+        tz_name, grace_hours, milestones,
+    )
+    last = len(deadlines) - 1
+
+    def check(commit_timestamp_iso: str) -> TimingResult:
+        # Parse commit timestamp and convert to team's timezone
+        # fromisoformat accepts a trailing "Z" natively on Python 3.11+
+        commit_utc = datetime.fromisoformat(commit_timestamp_iso)
+        # UTC commits in a UTC-configured team need no conversion
+        commit_local = commit_utc if commit_utc.tzinfo is tz else commit_utc.astimezone(tz)
+        commit_weekday = commit_local.weekday()
+
+        # Check if commit is on a class day
+        is_class_day = bool((class_days >> commit_weekday) & 1)
+
+        # Determine current milestone phase
+        if last < 0:
+            return _build_result(commit_local, commit_weekday, is_class_day, None, False, False, None)
+
+        # Deadlines are UTC instants, so compare the commit as an instant too
+        # (a naive timestamp only has a meaningful instant once localised)
+        commit_instant = commit_utc if commit_utc.tzinfo is not None else commit_local
+
+        # First milestone whose grace window hasn't closed yet
+        idx = bisect_left(deadlines_with_grace, commit_instant)
+        if idx <= last:
+            # A commit made after a deadline (i.e. inside its grace window)
+            # already counts towards the following phase
+            idx = max(idx, min(bisect_left(deadlines, commit_instant), last))
+            is_late = False
+        else:
+            # Commit is after all deadlines
+            idx = last
+            is_late = True
+
+        return _build_result(
+            commit_local, commit_weekday, is_class_day,
+            phase_names[idx], not is_late, is_late,
+            (deadline_dates[idx] - commit_local.date()).days,
+        )
+
+    return check
+
+
+def check_timing_batch(config: dict, commit_timestamps: list) -> list:
+    """
+    Evaluate many commits against one config in a single vectorised pass.
+
+    Timestamps are parsed and localised one by one, but the phase lookup,
+    lateness, day offsets and class-day checks run as NumPy array operations.
+
+    Args:
+        config: The .pbl/config.json contents
+        commit_timestamps: ISO 8601 timestamps of the commits
+
+    Returns:
+        list of TimingResult, one per commit, identical to check_timing's results
+    """
+    tz_name = config.get("timezone", "Asia/Kolkata")
+    tz = _get_zone(tz_name)
     grace_hours = config.get("grace_period_hours", 2)
-    class_days = [d.lower() for d in config.get("class_days", [])]
+    class_days = _prepare_class_days(tuple(config.get("class_days", ())))
     milestones = config.get("milestones", [])
 
-    # Parse commit timestamp and convert to team's timezone
-    commit_utc = datetime.fromisoformat(commit_timestamp_iso.replace("Z", "+00:00"))
-    commit_local = commit_utc.astimezone(timezone)
-    commit_day = commit_local.strftime("%A").lower()
-
-    # Check if commit is on a class day
-    is_class_day = commit_day in class_days
-
-    # Determine current milestone phase
-    current_phase = None
-    is_late = False
-    is_within_milestone = False
-    days_until_deadline = None
-    milestone_deadline = None
-
-    for i, milestone in enumerate(milestones):
-        deadline = datetime.strptime(milestone["deadline"], "%Y-%m-%d")
-        deadline = deadline.replace(tzinfo=timezone)
-        deadline_with_grace = deadline + timedelta(hours=grace_hours)
-
-        # Determine the start of the phase window
-        if i == 0:
-            phase_start = datetime.min.replace(tzinfo=timezone)
-        else:
-            prev_deadline = datetime.strptime(milestones[i - 1]["deadline"], "%Y-%m-%d")
-            phase_start = prev_deadline.replace(tzinfo=timezone)
-
-        # Check if commit falls in this phase
-        if commit_local <= deadline_with_grace and (current_phase is None or commit_local > phase_start):
-            current_phase = milestone["phase"]
-            milestone_deadline = deadline
-            days_until_deadline = (deadline.date() - commit_local.date()).days
-            is_within_milestone = True
-
-            if commit_local > deadline:
-                if commit_local <= deadline_with_grace:
-                    is_late = False  # Within grace period
-                else:
-                    is_late = True
-
-    # If no phase matched, commit is after all deadlines
-    if current_phase is None and milestones:
-        current_phase = milestones[-1]["phase"]
-        last_deadline = datetime.strptime(milestones[-1]["deadline"], "%Y-%m-%d")
-        last_deadline = last_deadline.replace(tzinfo=timezone)
-        milestone_deadline = last_deadline
-        days_until_deadline = (last_deadline.date() - commit_local.date()).days
-        is_late = True
-        is_within_milestone = False
-
-    # Determine status
-    if is_late:
-        status = "❌ Late"
-        status_emoji = "❌"
-    elif is_class_day:
-        status = "✅ On Time (Class Day)"
-        status_emoji = "✅"
-    else:
-        status = "✅ On Time"
-        status_emoji = "✅"
-
-    # Build result summary
-    if days_until_deadline is not None and days_until_deadline >= 0:
-        timing_detail = f"{current_phase} — {days_until_deadline} days before deadline"
-    elif days_until_deadline is not None:
-        timing_detail = f"{current_phase} — {abs(days_until_deadline)} days past deadline"
+    commits_local = [datetime.fromisoformat(ts).astimezone(tz) for ts in commit_timestamps]
+    if not commits_local:
+        return []
+
+    # Local wall-clock days for weekday and day offsets, UTC instants for the
+    # deadline comparisons
+    local_days = np.array(
+        [c.replace(tzinfo=None) for c in commits_local], dtype="datetime64[us]"
+    ).astype("datetime64[D]")
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekdays = (local_days.astype(np.int64) + 3) % 7
+    class_day_mask = np.array([bool((class_days >> i) & 1) for i in range(7)])
+    is_class_day = class_day_mask[weekdays]
+
+    deadlines, deadlines_with_grace, deadline_dates, phase_names = _prepare_milestones(
+        tz_name,
+        grace_hours,
+        tuple((m["phase"], m["deadline"]) for m in milestones),
+    )
+
+    if deadlines:
+        last = len(deadlines) - 1
+        instants = np.array(
+            [c.astimezone(timezone.utc).replace(tzinfo=None) for c in commits_local],
+            dtype="datetime64[us]",
+        )
+        deadline_arr = np.array([d.replace(tzinfo=None) for d in deadlines], dtype="datetime64[us]")
+        grace_arr = np.array([d.replace(tzinfo=None) for d in deadlines_with_grace], dtype="datetime64[us]")
+
+        # Same two bisections as check_timing, for every commit at once
+        idx = np.searchsorted(grace_arr, instants, side="left")
+        is_within = idx <= last
+        idx = np.where(
+            is_within,
+            np.maximum(idx, np.minimum(np.searchsorted(deadline_arr, instants, side="left"), last)),
+            last,
+        )
+        days_until = (np.array(deadline_dates, dtype="datetime64[D]")[idx] - local_days).astype(np.int64)
+
+        phases = [phase_names[i] for i in idx.tolist()]
+        is_within_list = is_within.tolist()
+        is_late_list = (~is_within).tolist()
+        days_list = days_until.tolist()
     else:
-        timing_detail = current_phase or "No milestone configured"
-
-    return {
-        "passed": not is_late,
-        "is_class_day": is_class_day,
-        "is_within_milestone": is_within_milestone,
-        "is_late": is_late,
-        "current_phase": current_phase,
-        "days_until_deadline": days_until_deadline,
-        "commit_day": commit_local.strftime("%A"),
-        "commit_local_time": commit_local.isoformat(),
-        "status": status,
-        "status_emoji": status_emoji,
-        "detail": timing_detail,
-    }
+        phases = [None] * len(commits_local)
+        is_within_list = is_late_list = [False] * len(commits_local)
+        days_list = [None] * len(commits_local)
+
+    return [
+        _build_result(commit_local, weekday, class_day, phase, within, late, days)
+        for commit_local, weekday, class_day, phase, within, late, days in zip(
+            commits_local, weekdays.tolist(), is_class_day.tolist(),
+            phases, is_within_list, is_late_list, days_list,
+        )
+    ]
+
+
+def _build_result(
+    commit_local: datetime,
+    commit_weekday: int,
+    is_class_day: bool,
+    current_phase: str,
+    is_within_milestone: bool,
+    is_late: bool,
+    days_until_deadline: int,
+) -> TimingResult:
+    """Assemble the result shared by check_timing and check_timing_batch."""
+    return TimingResult(
+        is_class_day=is_class_day,
+        is_within_milestone=is_within_milestone,
+        is_late=is_late,
+        current_phase=current_phase,
+        days_until_deadline=days_until_deadline,
+        commit_day=_WEEKDAYS[commit_weekday],
+        commit_local=commit_local,
+    )
 
 
 if __name__ == "__main__":
@@ -120,4 +363,4 @@ if __name__ == "__main__":
         ],
     }
     result = check_timing(test_config, "2026-02-28T10:30:00+05:30")
-    print(json.dumps(result, indent=2, default=str))
+    print(json.dumps(dict(result), indent=2, default=str))
@@ -5,4 +5,14 @@ conftest.py — Add the project root to sys.path so that
 import sys
 import os
 
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the checkers' on-disk caches out of the working tree."""
+    cache_dir = tmp_path / "pbl-cache"
+    monkeypatch.setenv("PBL_CACHE_DIR", str(cache_dir))
+    return cache_dir
@@ -4,7 +4,7 @@ Tests for PBL Guardian — Timing Checker
 
 import json
 import pytest
-from scripts.timing_checker import check_timing
+from scripts.timing_checker import check_timing, check_timing_batch, make_timing_checker
 
 
 @pytest.fixture
@@ -77,11 +77,37 @@ class TestTimingChecker:
         ]
         for key in required_keys:
             assert key in result, f"Missing key: {key}"
+
+    def test_result_is_read_only_mapping(self, sample_config):
+        result = check_timing(sample_config, "2026-02-28T10:30:00+05:30")
+        with pytest.raises(TypeError):
+            result["passed"] = None
+        assert result == dict(result)
+        assert json.loads(json.dumps(dict(result)))["passed"] is True
+
+    def test_batch_matches_single(self, sample_config):
+        timestamps = [
+            "2026-02-25T10:30:00+05:30",  # Not a class day
+            "2026-02-28T05:00:00Z",       # Class day, before Phase 1
+            "2026-03-01T01:30:00+05:30",  # Within grace period
+            "2026-03-10T10:30:00+05:30",  # Phase 2
+            "2026-04-01T10:30:00+05:30",  # Past all deadlines
+        ]
+        batch = check_timing_batch(sample_config, timestamps)
+        assert batch == [check_timing(sample_config, ts) for ts in timestamps]
+        assert check_timing_batch(sample_config, []) == []
+
+    def test_specialised_checker_matches_check_timing(self, sample_config):
+        check = make_timing_checker(sample_config)
+        for ts in ("2026-02-28T10:30:00+05:30", "2026-03-01T01:30:00+05:30", "2026-04-01T10:30:00+05:30"):
+            assert check(ts) == check_timing(sample_config, ts)
 """
 Tests for PBL Guardian — Contribution Checker (Gini calculation)
 """
 
-from scripts.contribution_checker import _calculate_gini
+import io
+from unittest.mock import patch
+from scripts.contribution_checker import _calculate_gini, _parse_git_numstat
 
 
 class TestGiniCoefficient:
@@ -112,12 +138,29 @@ class TestGiniCoefficient:
         assert gini > 0.3
 
 
+class TestGitNumstat:
+    def test_counts_match_shortlog_and_numstat(self):
+        # Alice: two commits, one touching a binary file; Bob: one empty commit
+        log = (
+            "\x01Alice\n\n3\t1\ta.py\n-\t-\timg.png\n"
+            "\x01Bob\n"
+            "\x01Alice\n\n2\t0\tb.py\n10\t4\tc.py\n"
+        )
+        with patch("scripts.contribution_checker.subprocess.Popen") as mock_popen:
+            mock_popen.return_value.stdout = io.StringIO(log)
+            mock_popen.return_value.returncode = 0
+            members = _parse_git_numstat()
+        # What `git shortlog -sn` plus `git log --numstat` report for this history
+        assert members == {
+            "Alice": {"commits": 2, "additions": 15, "deletions": 5},
+            "Bob": {"commits": 1, "additions": 0, "deletions": 0},
+        }
+
+
 """
 Tests for PBL Guardian — Proof Checker
 """
 
-import os
-import tempfile
 from unittest.mock import patch
 from scripts.proof_checker import check_proofs
 
@@ -126,14 +169,14 @@ class TestProofChecker:
     def test_no_proof_dir(self):
         """When proof directory doesn't exist."""
         with patch("scripts.proof_checker.subprocess.run") as mock_run:
-            mock_run.return_value.stdout = ""
+            mock_run.return_value.stdout = b""
             mock_run.return_value.returncode = 0
             result = check_proofs(proof_dir="/nonexistent/path", commit_sha="HEAD")
             assert result["total_proofs_in_repo"] == 0
 
     def test_result_structure(self):
         with patch("scripts.proof_checker.subprocess.run") as mock_run:
-            mock_run.return_value.stdout = ""
+            mock_run.return_value.stdout = b""
             mock_run.return_value.returncode = 0
             result = check_proofs(proof_dir="/nonexistent", commit_sha="HEAD")
             required_keys = [
@@ -143,22 +186,18 @@ class TestProofChecker:
             for key in required_keys:
                 assert key in result, f"Missing key: {key}"
 
-    def test_detail_stripping_no_garbled_text(self):
+    def test_detail_stripping_no_garbled_text(self, fs):
         """Ensure the detail field doesn't have garbled emoji residue."""
         with patch("scripts.proof_checker.subprocess.run") as mock_run:
-            mock_run.return_value.stdout = "src/main.py\nproofs/screenshot1.png\n"
+            mock_run.return_value.stdout = b"src/main.py\x00proofs/screenshot1.png\x00"
             mock_run.return_value.returncode = 0
 
-            with tempfile.TemporaryDirectory() as tmpdir:
-                proof_dir = os.path.join(tmpdir, "proofs")
-                os.makedirs(proof_dir)
-                # Create a fake screenshot
-                with open(os.path.join(proof_dir, "screenshot1.png"), "wb") as f:
-                    f.write(b"fake")
-                result = check_proofs(proof_dir=proof_dir, commit_sha="HEAD")
-                # detail should not start with emoji characters
-                assert not result["detail"].startswith("✅")
-                assert not result["detail"].startswith("❌")
+            # Create a fake screenshot
+            fs.create_file("/repo/proofs/screenshot1.png", contents=b"fake")
+            result = check_proofs(proof_dir="/repo/proofs", commit_sha="HEAD")
+            # detail should not start with emoji characters
+            assert not result["detail"].startswith("✅")
+            assert not result["detail"].startswith("❌")
 
 
 """
@@ -166,22 +205,19 @@ Tests for PBL Guardian — Plagiarism Checker (L4 AI Detection, L5 Commit Patter
 """
 
 import os
-import tempfile
 from scripts.plagiarism_checker import layer4_ai_detection, layer5_commit_patterns
 
 
 class TestL4AIDetection:
-    def test_no_python_files(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = layer4_ai_detection(tmpdir)
-            assert result["passed"] is True
-            assert result["ai_score"] == 0.0
-
-    def test_simple_human_code(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Write simple, human-like code (few comments, short vars)
-            with open(os.path.join(tmpdir, "main.py"), "w") as f:
-                f.write("""
+    def test_no_python_files(self, fs):
+        fs.create_dir("/src")
+        result = layer4_ai_detection("/src")
+        assert result["passed"] is True
+        assert result["ai_score"] == 0.0
+
+    def test_simple_human_code(self, fs):
+        # Write simple, human-like code (few comments, short vars)
+        fs.create_file("/src/main.py", contents="""
 def add(a, b):
     return a + b
 
@@ -196,19 +232,72 @@ def run():
 if __name__ == "__main__":
     run()
 """)
-            result = layer4_ai_detection(tmpdir)
-            assert result["ai_score"] < 0.5
-            assert result["passed"] is True
+        result = layer4_ai_detection("/src")
+        assert result["ai_score"] < 0.5
+        assert result["passed"] is True
 
-    def test_result_structure(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with open(os.path.join(tmpdir, "test.py"), "w") as f:
-                f.write("x = 1\n")
-            result = layer4_ai_detection(tmpdir)
-            assert "ai_score" in result
-            assert "flags" in result
-            assert "passed" in result
-            assert "detail" in result
+    def test_result_structure(self, fs):
+        fs.create_file("/src/test.py", contents="x = 1\n")
+        result = layer4_ai_detection("/src")
+        assert "ai_score" in result
+        assert "flags" in result
+        assert "passed" in result
+        assert "detail" in result
+
+    def test_cached_analysis_matches_fresh(self, fs, isolated_cache_dir, monkeypatch):
+        fs.create_file(
+            "/src/main.py",
+            contents="# comment\ndef add(a, b):\n    \"\"\"Add.\"\"\"\n    total = a + b\n    return total\n",
+        )
+        fresh = layer4_ai_detection("/src")
+        assert list(isolated_cache_dir.rglob("*.json"))
+
+        # A cache hit must not re-analyse the source
+        def fail(*args):
+            raise AssertionError("cache miss")
+        monkeypatch.setattr("scripts.plagiarism_checker._summarize_source", fail)
+        cached = layer4_ai_detection("/src")
+        assert cached == fresh
+
+    def test_malformed_cache_entry_is_a_miss(self, fs, isolated_cache_dir):
+        fs.create_file("/src/main.py", contents="def add(a, b):\n    return a + b\n")
+        fresh = layer4_ai_detection("/src")
+        (entry,) = isolated_cache_dir.rglob("*.json")
+        entry.write_text("{}")
+        assert layer4_ai_detection("/src") == fresh
+
+    def test_ai_style_code_is_flagged(self, fs):
+        fs.create_file("/src/main.py", contents=(
+            "# Process the incoming request payload\n"
+            "# Load it, then normalise it\n"
+            "# Fall back to None when it is invalid\n"
+            "# The caller handles the None case\n"
+            "# This keeps the pipeline robust\n"
+            "def process_request_payload():\n"
+            "    \"\"\"Process the payload.\"\"\"\n"
+            "    try:\n"
+            "        normalized_request_payload = load()\n"
+            "    except ValueError:\n"
+            "        normalized_request_payload = None\n"
+        ) * 4)
+        result = layer4_ai_detection("/src")
+        assert result["passed"] is False
+        assert result["ai_score"] >= 0.6
+        assert any("comment ratio" in flag for flag in result["flags"])
+        assert any("try/except" in flag for flag in result["flags"])
+
+
+    def test_long_elif_chain_does_not_overflow(self, fs):
+        branches = "".join(f"    elif x == {i}:\n        return {i}\n" for i in range(1, 400))
+        fs.create_file("/src/main.py", contents="def pick(x):\n    if x == 0:\n        return 0\n" + branches)
+        result = layer4_ai_detection("/src")
+        assert "ai_score" in result
+
+    def test_unparsably_deep_expression_is_skipped(self, fs):
+        fs.create_file("/src/deep.py", contents="x = " + " + ".join(["1"] * 3000) + "\n")
+        fs.create_file("/src/main.py", contents="def add(a, b):\n    return a + b\n")
+        result = layer4_ai_detection("/src")
+        assert "ai_score" in result
 
 
 class TestL5CommitPatterns:
@@ -256,3 +345,27 @@ class TestQualityChecker:
         required_keys = ["passed", "score", "issues", "detail", "status", "status_emoji"]
         for key in required_keys:
             assert key in result, f"Missing key: {key}"
+
+
+"""
+Tests for PBL Guardian — File Utilities
+"""
+
+from scripts.file_utils import iter_py_files
+
+
+class TestIterPyFiles:
+    def test_matches_os_walk_order(self, tmp_path):
+        # A real directory: the result must follow the OS's own listing order
+        for path in ("b.py", ".hidden.py", "pkg/a.py", "pkg/sub/c.py",
+                     "z/d.py", ".git/x.py", "__pycache__/e.py", "notes.txt"):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).touch()
+        root = str(tmp_path)
+        expected = []
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+            expected.extend(os.path.join(dirpath, f) for f in files if f.endswith(".py"))
+        assert list(iter_py_files(root)) == expected
+        assert os.path.join(root, ".hidden.py") in expected
+        assert len(expected) == 5